@@ -1,21 +1,28 @@
-import json
 import os
+import socket
+import socketserver
+import stat
 import sys
+from pathlib import Path
+import numpy as np
+import orjson
+import pandas as pd
 from kbs import KnowledgeBase
 
 
 def parse_json(in_filepath):
-    with open(in_filepath, "r", encoding="utf-8") as in_file:
-        in_data = json.load(in_file)
-        in_file.close()
-
-    return in_data
+    return orjson.loads(Path(in_filepath).read_bytes())
 
 
 def output_json(out_filepath, out_data):
-    with open(out_filepath, "w", encoding="utf-8") as out_file:
-        json.dump(out_data, out_file, indent=4)
-        out_file.close()
+    # int_to_node has int keys, which orjson only serializes with
+    # OPT_NON_STR_KEYS (they are written as strings, like json.dump does)
+    with open(out_filepath, "wb") as out_file:
+        out_file.write(
+            orjson.dumps(
+                out_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        )
 
 
 def gen_dicts(kb, name_to_id):
@@ -28,16 +35,11 @@ def gen_dicts(kb, name_to_id):
     :type name_to_id: dict
     """
 
-    int_to_node = {}
-    node_to_int = {}
-
     # Node2vec does not handle KB ids, so it is necessary to
-    # convert them to ints
-    for i, node in enumerate(name_to_id):
-        node_id = name_to_id[node]
-        # Assign an internal ID to each KB concept
-        int_to_node[i] = node_id
-        node_to_int[node_id] = i
+    # convert them to ints: assign an internal ID to each KB concept
+    node_ids = list(name_to_id.values())
+    int_to_node = dict(enumerate(node_ids))
+    node_to_int = {node_id: i for i, node_id in enumerate(node_ids)}
 
     kb_dir = f"data/kbs/{kb}/"
     os.makedirs(kb_dir, exist_ok=True)
@@ -51,27 +53,179 @@ def build_node2vec_input(kb, kb_edges):
 
     """
 
-    node_to_int = parse_json(f"data/kbs/{kb}/node_id_to_int.json")
-    output = ""
+    node_to_int = pd.Series(parse_json(f"data/kbs/{kb}/node_id_to_int.json"))
+    edges_df = pd.DataFrame(kb_edges, columns=["node_1", "node_2"])
 
-    for edge in kb_edges:
-        if edge[0] in node_to_int and edge[1] in node_to_int:
-            edge_1 = node_to_int[edge[0]]
-            edge_2 = node_to_int[edge[1]]
-            output += f"{str(edge_1)} {str(edge_2)}\n"
+    # Map the KB IDs to internal IDs, dropping the edges with concepts
+    # that have no internal ID
+    edges_df["node_1"] = edges_df["node_1"].map(node_to_int)
+    edges_df["node_2"] = edges_df["node_2"].map(node_to_int)
+    edges_df = edges_df.dropna().astype(np.int32)
 
-    with open(f"node2vec/graph/{kb}.edgelist", "w", encoding="utf-8") as f:
-        f.write(output)
-        f.close()
+    # Also write the edges in binary format (two int32 per edge), which is
+    # ~4x smaller than the text edgelist and needs no parsing to reload
+    edges_df.to_numpy().tofile(f"node2vec/graph/{kb}.bin")
 
+    edges_df.to_csv(
+        f"node2vec/graph/{kb}.edgelist",
+        sep=" ",
+        header=False,
+        index=False,
+        lineterminator="\n",
+    )
 
-if __name__ == "__main__":
-    kb = sys.argv[1]  # Target knowledge base
-    file_format = sys.argv[2]  # File format of the target knowledge base: tsv, obo
+
+def load_binary_edgelist(in_filepath):
+    """Load the edges written in binary format by build_node2vec_input.
+
+    :param in_filepath: path to the .bin file
+    :type in_filepath: str
+    :return: array with one (node_1, node_2) row of internal IDs per edge
+    :rtype: numpy.ndarray
+    """
+
+    return np.fromfile(in_filepath, dtype=np.int32).reshape(-1, 2)
+
+
+def remove_stale_socket(socket_path):
+    """Remove the socket left behind by a server that was killed (e.g. with
+    SIGTERM), which would otherwise make bind fail. Any other file at
+    socket_path, or the socket of a running server, is left untouched.
+
+    :param socket_path: path of the Unix socket to listen on
+    :type socket_path: str
+    :raises FileExistsError: if socket_path is in use
+    """
+
+    if not os.path.lexists(socket_path):
+        return
+
+    if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+
+        except ConnectionRefusedError:
+            # No server is listening on the socket
+            os.remove(socket_path)
+            return
+
+    raise FileExistsError(f"{socket_path} is in use by a running server")
+
+
+def serve(kb, file_format, socket_path):
+    """Load the target knowledge base once and serve requests on a Unix
+    socket, so that the knowledge base is not parsed again for every request.
+
+    Each request is a line with one of the commands 'gen_dicts',
+    'build_node2vec_input' or 'shutdown', and the reply is a line with 'ok'
+    or 'error: <message>'.
+
+    :param kb: target knowledge base
+    :type kb: str
+    :param file_format: file format of the target knowledge base
+    :type file_format: str
+    :param socket_path: path of the Unix socket to listen on
+    :type socket_path: str
+    """
+
+    remove_stale_socket(socket_path)
 
     kb_data = KnowledgeBase(kb, file_format=file_format)
-    name_to_id = kb_data.name_to_id
-    kb_edges = kb_data.edges
+    commands = {
+        "gen_dicts": lambda: gen_dicts(kb, kb_data.name_to_id),
+        "build_node2vec_input": lambda: build_node2vec_input(kb, kb_data.edges),
+    }
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        # Requests are handled one at a time, so drop a client that stays idle
+        # instead of letting it block the server
+        timeout = 60
+
+        def handle(self):
+            try:
+                for line in self.rfile:
+                    self.handle_command(line.decode("utf-8").strip())
+
+            except TimeoutError:
+                pass
+
+        def handle_command(self, command):
+
+            if command == "shutdown":
+                self.server.running = False
+                reply = "ok"
+
+            elif command in commands:
+                try:
+                    commands[command]()
+                    reply = "ok"
+
+                except Exception as error:
+                    reply = f"error: {error}"
+
+            else:
+                reply = f"error: unknown command '{command}'"
+
+            self.wfile.write(f"{reply}\n".encode("utf-8"))
+
+    with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+        server.running = True
+
+        try:
+            while server.running:
+                server.handle_request()
+
+        finally:
+            os.remove(socket_path)
+
+
+def send_request(socket_path, command, timeout=3600):
+    """Send a command to a knowledge base served with 'serve' and return the
+    reply.
+
+    :param socket_path: path of the Unix socket the knowledge base is served on
+    :type socket_path: str
+    :param command: command to send
+    :type command: str
+    :param timeout: seconds to wait for the server before raising TimeoutError
+    :type timeout: float
+    :return: reply of the server
+    :rtype: str
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(f"{command}\n".encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+
+        with client.makefile("r", encoding="utf-8") as reply:
+            return reply.readline().strip()
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "serve":
+        # Load the KB once and serve requests: serve <kb> <format> <socket>
+        serve(sys.argv[2], sys.argv[3], sys.argv[4])
+
+    elif sys.argv[1] == "request":
+        # Send a command to a served KB: request <socket> <command>
+        reply = send_request(sys.argv[2], sys.argv[3])
+        print(reply)
+
+        if reply != "ok":
+            sys.exit(1)
+
+    else:
+        kb = sys.argv[1]  # Target knowledge base
+        file_format = sys.argv[2]  # File format of the target knowledge base: tsv, obo
+
+        kb_data = KnowledgeBase(kb, file_format=file_format)
+        name_to_id = kb_data.name_to_id
+        kb_edges = kb_data.edges
 
-    gen_dicts(kb, name_to_id)
-    build_node2vec_input(kb, kb_edges)
+        gen_dicts(kb, name_to_id)
+        build_node2vec_input(kb, kb_edges)
@@ -2,10 +2,204 @@
 objects (dictionaries and Networkx graph)."""
 
 import csv
+import hashlib
+import mmap
+import os
+import pickle
+import re
+import sys
+import tempfile
+from collections import Counter, defaultdict
 import networkx as nx
-import obonet
 
 data_dir = "data/kbs/"
+ncbi_taxon_filepath = f"{data_dir}NCBITAXON.csv"
+ncbi_gene_filepath = f"{data_dir}ncbi_gene/All_Data.gene_info"
+
+# The cache key of a KB (see KnowledgeBase._load_cached) includes a hash of
+# this module's source, so any change to the loaders invalidates existing
+# caches. Bump cache_version only when the cached attributes (name_to_id,
+# id_to_name, id_to_info, synonym_to_id, edges, graph, node_to_node,
+# child_to_parent, alt_id_to_id, umls_to_hp) change for a reason outside
+# this module, e.g. a new version of a dependency.
+cache_version = 3
+
+with open(__file__, "rb") as module_file:
+    module_hash = hashlib.sha256(module_file.read()).hexdigest()
+
+# Tags of the .obo [Term] stanzas that are used by load_obo. As in obonet,
+# single-valued tags are stored as strings and the others as lists.
+obo_single_tags = {"id", "name", "namespace", "is_obsolete"}
+obo_list_tags = {"alt_id", "is_a", "synonym", "xref", "relationship"}
+
+# Value of an .obo tag-value pair, without trailing modifiers and comments
+obo_value_pattern = re.compile(r"\s*(.*?)(?:\s\{[^{}]*\})?(?:\s!.*)?\s*$")
+
+# Quoted text of an .obo synonym value, e.g. '"text" EXACT []'
+obo_synonym_pattern = re.compile(r'"([^"]*)"')
+
+
+def _iter_obo_terms(filepath):
+    """Parse the [Term] stanzas of an .obo file one at a time, keeping only
+    the tags used by load_obo, instead of building the full ontology graph.
+
+    :param filepath: path to the .obo file
+    :type filepath: str
+    :return: (term ID, dict with the tags of the term) for each term
+    :rtype: generator
+    """
+
+    term = None
+
+    with open(filepath, "r", encoding="utf-8") as obo_file:
+        for line in obo_file:
+            if line[0] == "[":
+                # Start of a new stanza
+                if term and "id" in term:
+                    yield term.pop("id"), term
+
+                term = {} if line.startswith("[Term]") else None
+                continue
+
+            if term is None:
+                # Header or non-term stanza ([Typedef], [Instance])
+                continue
+
+            tag, _, value = line.partition(":")
+
+            if tag in obo_single_tags:
+                term[tag] = obo_value_pattern.match(value).group(1)
+
+            elif tag in obo_list_tags:
+                value = obo_value_pattern.match(value).group(1)
+                term.setdefault(tag, []).append(value)
+
+    if term and "id" in term:
+        yield term.pop("id"), term
+
+
+def _iter_tsv_rows(filepath, num_header_rows, max_split):
+    """Read the rows of a tab-separated file through a memory map, splitting
+    each row only as far as the columns the caller needs.
+
+    :param filepath: path to the .tsv file
+    :type filepath: str
+    :param num_header_rows: number of rows to skip at the start of the file
+    :type num_header_rows: int
+    :param max_split: maximum number of splits per row, so the last column
+        needed by the caller must have an index lower than max_split
+    :type max_split: int
+    :return: list with the (undecoded) fields of each non-empty row
+    :rtype: generator
+    """
+
+    with open(filepath, "rb") as tsv_file:
+        if os.fstat(tsv_file.fileno()).st_size == 0:
+            # An empty file cannot be memory-mapped
+            return
+
+        with mmap.mmap(tsv_file.fileno(), 0, access=mmap.ACCESS_READ) as tsv_map:
+            for _ in range(num_header_rows):
+                tsv_map.readline()
+
+            for line in iter(tsv_map.readline, b""):
+                line = line.rstrip(b"\r\n")
+
+                if line:
+                    yield line.split(b"\t", max_split)
+
+
+def _count_descendants(kb_graph):
+    """Count the descendants (nodes reachable from a node, as returned by
+    nx.descendants) of every node in the graph.
+
+    The descendants of a node are its successors plus their descendants, so
+    they are memoized in a single sweep over the graph in reverse
+    topological order. If the graph has cycles, the sweep runs over its
+    condensation, where each strongly connected component is a single node.
+
+    :param kb_graph: graph built from the edges of the knowledge base
+    :type kb_graph: networkx.DiGraph
+    :return: number of descendants of each node
+    :rtype: dict
+    """
+
+    try:
+        descendants = {}
+
+        for node in reversed(list(nx.topological_sort(kb_graph))):
+            node_descendants = set()
+
+            for successor in kb_graph.successors(node):
+                node_descendants.add(successor)
+                node_descendants |= descendants[successor]
+
+            descendants[node] = node_descendants
+
+        return {node: len(descendants[node]) for node in descendants}
+
+    except nx.NetworkXUnfeasible:
+        # There is no topological order if the graph has cycles
+        pass
+
+    condensed_graph = nx.condensation(kb_graph)
+    reachable = {}
+
+    for component in reversed(list(nx.topological_sort(condensed_graph))):
+        # Every member of a component is reachable from the other members
+        component_reachable = set(condensed_graph.nodes[component]["members"])
+
+        for successor in condensed_graph.successors(component):
+            component_reachable |= reachable[successor]
+
+        reachable[component] = component_reachable
+
+    node_to_component = condensed_graph.graph["mapping"]
+
+    # A node is not one of its own descendants
+    return {
+        node: len(reachable[node_to_component[node]]) - 1 for node in kb_graph.nodes
+    }
+
+
+def _build_id_to_info(kb_graph, edges):
+    """Build id_to_info (KB-ID: (outdegree, indegree, num_descendants)).
+
+    :param kb_graph: graph built from the edges of the knowledge base
+    :type kb_graph: networkx.DiGraph
+    :param edges: unique (child, parent) relations between concepts
+    :type edges: list
+    :return: id_to_info
+    :rtype: dict
+    """
+
+    out_degree = Counter(edge[0] for edge in edges)
+    in_degree = Counter(edge[1] for edge in edges)
+    num_descendants = _count_descendants(kb_graph)
+
+    return {
+        node: (out_degree[node], in_degree[node], num_descendants[node])
+        for node in kb_graph.nodes
+    }
+
+
+def _build_adjacency(edges):
+    """Build node_to_node, mapping each concept to the concepts it is
+    directly linked to, regardless of the direction of the edge.
+
+    :param edges: (child, parent) relations between concepts
+    :type edges: list
+    :return: node_to_node
+    :rtype: dict
+    """
+
+    node_to_node = defaultdict(list)
+
+    for node_1, node_2 in edges:
+        node_to_node[node_1].append(node_2)
+        node_to_node[node_2].append(node_1)
+
+    return dict(node_to_node)
 
 
 class KnowledgeBase:
@@ -18,6 +212,7 @@ class KnowledgeBase:
         edges_filename=None,
         kb_filename=None,
         file_format=None,
+        use_cache=True,
     ):
         self.kb = kb
         self.terms_filename = terms_filename
@@ -49,7 +244,16 @@ class KnowledgeBase:
         # ---------------------------------------------------------------------
         #                 Load the info about the given KB
         # ---------------------------------------------------------------------
-        if file_format == "obo":
+        if use_cache:
+            self._load_cached()
+
+        else:
+            self._load()
+
+    def _load(self):
+        """Parse the local files of the KB with the loader for its format."""
+
+        if self.file_format == "obo":
             self.load_obo()
 
         elif self.file_format == "tsv":
@@ -64,14 +268,95 @@ class KnowledgeBase:
         elif self.file_format == "txt":
             self.load_txt()
 
-    def load_obo(self):
-        """Load KBs from local .obo files (ChEBI, HP, MEDIC, GO) into
-        structured dicts containing the mappings name_to_id, id_to_name,
-        id_to_info, synonym_to_id, child_to_parent, umls_to_hp and the list of
-        edges between concepts. For 'chebi', only the concepts in the subset
-        3_STAR are included, which correpond to manually validated entries.
+    def _source_filepaths(self):
+        """Return the paths of the local files from which the KB is loaded."""
+
+        if self.file_format == "obo":
+            return [self._obo_filepath()]
+
+        elif self.file_format == "tsv":
+            return [self._tsv_filepath()]
+
+        elif self.kb == "ncbi_taxon":
+            return [ncbi_taxon_filepath]
+
+        elif self.kb == "ncbi_gene":
+            return [ncbi_gene_filepath]
+
+        elif self.file_format == "txt":
+            return [self.terms_filename, self.edges_filename]
+
+        return []
+
+    def _load_cached(self):
+        """Load the KB from the cache file in its data dir if the source files
+        did not change since the cache was written (same modification time
+        and size). Otherwise, parse the source files and rewrite the cache.
         """
 
+        filepaths = self._source_filepaths()
+
+        if not filepaths:
+            self._load()
+            return
+
+        cache_key = (
+            cache_version,
+            module_hash,
+            self.file_format,
+            [
+                (filepath, os.path.getmtime(filepath), os.path.getsize(filepath))
+                for filepath in filepaths
+            ],
+        )
+        cache_dir = f"{data_dir}{self.kb}/"
+        cache_filepath = f"{cache_dir}.cache.pkl"
+
+        if os.path.exists(cache_filepath):
+            try:
+                with open(cache_filepath, "rb") as cache_file:
+                    # The key is stored first, so the data is only
+                    # unpickled when the cache is valid
+                    if pickle.load(cache_file) == cache_key:
+                        cached_data = pickle.load(cache_file)
+                        self.__dict__.update(cached_data)
+                        return
+
+            except Exception:
+                # Unreadable cache (e.g. written with other versions of
+                # Python or networkx): parse the source files instead
+                pass
+
+        self._load()
+
+        tmp_filepath = None
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+
+            # Write to a uniquely named file, so that processes loading the
+            # same KB at the same time do not write to the same file
+            with tempfile.NamedTemporaryFile(
+                dir=cache_dir, prefix=".cache.", suffix=".tmp", delete=False
+            ) as cache_file:
+                tmp_filepath = cache_file.name
+                pickle.dump(cache_key, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(
+                    self.__dict__, cache_file, protocol=pickle.HIGHEST_PROTOCOL
+                )
+
+            os.replace(tmp_filepath, cache_filepath)
+
+        except OSError:
+            # The cache is optional, e.g. data_dir may be read-only
+            if tmp_filepath is not None:
+                try:
+                    os.remove(tmp_filepath)
+
+                except OSError:
+                    pass
+
+    def _obo_filepath(self):
         filepath = data_dir
         filepaths = {
             "medic": "CTD_diseases",
@@ -91,101 +376,144 @@ class KnowledgeBase:
         else:
             filepath += self.kb_filename
 
+        return filepath
+
+    def _tsv_filepath(self):
+        kb_dict = {
+            "ctd_chem": "CTD_chemicals",
+            "ctd_anat": "CTD_anatomy",
+            "ctd_gene": "CTD_genes",
+            "medic": "CTD_diseases",
+        }
+
+        return f"{data_dir}{self.kb}/{kb_dict[self.kb]}.tsv"
+
+    def _finalize(self, name_to_id, id_to_name, synonym_to_id, edges, **extras):
+        """Build the graph, id_to_info and node_to_node from the edges parsed
+        by a loader and store them, together with the loader's mappings, as
+        attributes of the knowledge base. Any additional mappings (e.g.
+        child_to_parent) are passed as keyword arguments.
+        """
+
+        # Remove repeated edges (e.g. is_a relations stated more than once),
+        # keeping the order in which they were parsed
+        edges = list(dict.fromkeys(edges))
+        kb_graph = nx.DiGraph(edges)
+
+        self.name_to_id = name_to_id
+        self.id_to_name = id_to_name
+        # Build id_to_info (KB-ID: (outdegree, indegree, num_descendants))
+        self.id_to_info = _build_id_to_info(kb_graph, edges)
+        self.synonym_to_id = synonym_to_id
+        self.edges = edges
+        self.graph = kb_graph
+        self.node_to_node = _build_adjacency(edges)
+        self.__dict__.update(extras)
+
+    def load_obo(self):
+        """Load KBs from local .obo files (ChEBI, HP, MEDIC, GO) into
+        structured dicts containing the mappings name_to_id, id_to_name,
+        id_to_info, synonym_to_id, child_to_parent, umls_to_hp and the list of
+        edges between concepts. For 'chebi', only the concepts in the subset
+        3_STAR are included, which correpond to manually validated entries.
+        """
+
+        filepath = self._obo_filepath()
         name_to_id = {}
         id_to_name = {}
-        id_to_info = {}
         synonym_to_id = {}
         child_to_parent = {}
         alt_id_to_id = {}
         umls_to_hp = {}
 
-        graph = obonet.read_obo(filepath)
         edges = []
 
-        for node in graph.nodes(data=True):
-            add_node = False
+        for node_id, attrs in _iter_obo_terms(filepath):
+            node_name = attrs.get("name")
 
-            if "name" in node[1]:
-                node_id, node_name = node[0], node[1]["name"]
+            if node_name is None:
+                continue
 
-                # node_id = node_id.replace(':', '_')
+            if attrs.get("is_obsolete") == "true":
+                continue
 
-                if self.kb == "go_bp":
-                    # For go_bp, ensure that only Biological Process
-                    # concepts are considered
+            # node_id = node_id.replace(':', '_')
 
-                    if node[1]["namespace"] == "biological_process":
-                        name_to_id[node_name] = node_id
-                        id_to_name[node_id] = node_name
-                        # id_to_info[node_id] = node_name
-                        add_node = True
+            # The same IDs appear in several dicts and in the edges, so
+            # intern them to share a single string object
+            node_id = sys.intern(node_id)
+            alt_ids = attrs.get("alt_id")
 
-                elif self.kb == "go_cc":
-                    if node[1]["namespace"] == "cellular_component":
-                        name_to_id[node_name] = node_id
-                        id_to_name[node_id] = node_name
-                        # id_to_info[node_id] = node_name
-                        add_node = True
-
-                elif self.kb == "medic":
-                    # if node_id[0:4] != "OMIM":
-                    #    # Exclude OMIM concepts #TODO: revise later
-                    name_to_id[node_name] = node_id
-                    id_to_name[node_id] = node_name
-                    add_node = True
-
-                else:
-                    name_to_id[node_name] = node_id
-                    id_to_name[node_id] = node_name
-                    add_node = True
-
-                if "alt_id" in node[1].keys():
-                    for alt_id in node[1]["alt_id"]:
-                        # alt_id_to_id[alt_id.replace(':', '_')] = node_id
-                        alt_id_to_id[alt_id] = node_id
-
-                if "is_obsolete" in node[1].keys() and node[1]["is_obsolete"] is True:
-                    add_node = False
-                    del name_to_id[node_name]
-                    del id_to_name[node_id]
-
-                # Check parents for this node
-                if "is_a" in node[1].keys() and add_node:
-                    # The root node of the ontology does not
-                    # have is_a relationships
-
-                    if len(node[1]["is_a"]) == 1:
-                        # Only consider concepts with 1 direct ancestor
-                        child_to_parent[node_id] = node[1]["is_a"][0]
-
-                    for parent in node[1]["is_a"]:
-                        # To build the edges list, consider all
-                        # concepts with at least one ancestor
-                        edges.append((node_id, parent))
-
-                if self.kb == "cellosaurus":
-                    if "relationship" in node[1].keys() and add_node:
-                        relations = node[1]["relationship"]
-
-                        for relation in relations:
-                            if relation[:13] == "derived_from ":
-                                parent = relation.split("derived_from")[1][1:]
-                                edges.append((parent, node_id))
-
-                if "synonym" in node[1].keys() and add_node:
-                    # Check for synonyms for node (if they exist)
-
-                    for synonym in node[1]["synonym"]:
-                        synonym_name = synonym.split('"')[1]
-                        synonym_to_id[synonym_name] = node_id
-
-                if "xref" in node[1].keys() and add_node:
-                    if self.kb == "hp":
-                        # Map UMLS concepts to HPO concepts
-                        for xref in node[1]["xref"]:
-                            if xref[:4] == "UMLS":
-                                umls_id = xref.strip("UMLS:")
-                                umls_to_hp[umls_id] = node_id
+            if alt_ids:
+                for alt_id in alt_ids:
+                    # alt_id_to_id[alt_id.replace(':', '_')] = node_id
+                    alt_id_to_id[alt_id] = node_id
+
+            if self.kb == "go_bp":
+                # For go_bp, ensure that only Biological Process
+                # concepts are considered
+                if attrs.get("namespace") != "biological_process":
+                    continue
+
+            elif self.kb == "go_cc":
+                if attrs.get("namespace") != "cellular_component":
+                    continue
+
+            # elif self.kb == "medic":
+            #    if node_id[0:4] == "OMIM":
+            #        # Exclude OMIM concepts #TODO: revise later
+            #        continue
+
+            name_to_id[node_name] = node_id
+            id_to_name[node_id] = node_name
+
+            # Check parents for this node
+            parents = attrs.get("is_a")
+
+            if parents:
+                # The root node of the ontology does not
+                # have is_a relationships
+                parents = [sys.intern(parent) for parent in parents]
+
+                if len(parents) == 1:
+                    # Only consider concepts with 1 direct ancestor
+                    child_to_parent[node_id] = parents[0]
+
+                for parent in parents:
+                    # To build the edges list, consider all
+                    # concepts with at least one ancestor
+                    edges.append((node_id, parent))
+
+            if self.kb == "cellosaurus":
+                relations = attrs.get("relationship")
+
+                if relations:
+                    for relation in relations:
+                        if relation[:13] == "derived_from ":
+                            parent = relation.split("derived_from")[1][1:]
+                            parent = sys.intern(parent)
+                            edges.append((parent, node_id))
+
+            synonyms = attrs.get("synonym")
+
+            if synonyms:
+                # Check for synonyms for node (if they exist)
+
+                for synonym in synonyms:
+                    synonym_match = obo_synonym_pattern.search(synonym)
+
+                    if synonym_match:
+                        synonym_to_id[synonym_match.group(1)] = node_id
+
+            if self.kb == "hp":
+                xrefs = attrs.get("xref")
+
+                if xrefs:
+                    # Map UMLS concepts to HPO concepts
+                    for xref in xrefs:
+                        if xref.startswith("UMLS:"):
+                            umls_id = xref[5:]
+                            umls_to_hp[umls_id] = node_id
 
         if self.kb in self.root_dict:
             root_concept_name = self.root_dict[self.kb][1]
@@ -209,43 +537,15 @@ class KnowledgeBase:
             application = "CHEBI_33232"
             edges.append((application, root_id))
 
-        kb_graph = nx.DiGraph([edge for edge in edges])
-
-        # Build id_to_info (KB-ID: (outdegree, indegree, num_descendants))
-        for node in kb_graph.nodes:
-            num_descendants = len(nx.descendants(kb_graph, node))
-
-            id_to_info[node] = (
-                kb_graph.out_degree(node),
-                kb_graph.in_degree(node),
-                num_descendants,
-            )
-
-        node_to_node = {}
-
-        for edge in edges:
-            if edge[0] in node_to_node:
-                node_to_node[edge[0]].append(edge[1])
-
-            else:
-                node_to_node[edge[0]] = [edge[1]]
-
-            if edge[1] in node_to_node:
-                node_to_node[edge[1]].append(edge[0])
-
-            else:
-                node_to_node[edge[1]] = [edge[0]]
-
-        self.name_to_id = name_to_id
-        self.id_to_name = id_to_name
-        self.id_to_info = id_to_info
-        self.synonym_to_id = synonym_to_id
-        self.edges = edges
-        self.graph = kb_graph
-        self.child_to_parent = child_to_parent
-        self.alt_id_to_id = alt_id_to_id
-        self.umls_to_hp = umls_to_hp
-        self.node_to_node = node_to_node
+        self._finalize(
+            name_to_id,
+            id_to_name,
+            synonym_to_id,
+            edges,
+            child_to_parent=child_to_parent,
+            alt_id_to_id=alt_id_to_id,
+            umls_to_hp=umls_to_hp,
+        )
 
     def load_tsv(self):
         """Load KBs from local .tsv files (CTD-Chemicals, CTD-Anatomy)
@@ -254,103 +554,60 @@ class KnowledgeBase:
            between concepts.
         """
 
-        kb_dict = {
-            "ctd_chem": "CTD_chemicals",
-            "ctd_anat": "CTD_anatomy",
-            "ctd_gene": "CTD_genes",
-            "medic": "CTD_diseases",
-        }
-        filepath = f"{data_dir}{self.kb}/{kb_dict[self.kb]}.tsv"
+        filepath = self._tsv_filepath()
 
         name_to_id = {}
         id_to_name = {}
-        id_to_info = {}
         synonym_to_id = {}
         child_to_parent = {}
         edges = []
 
-        with open(filepath) as kb_file:
-            reader = csv.reader(kb_file, delimiter="\t")
-            row_count = int()
-
-            for row in reader:
-                row_count += 1
-
-                if row_count >= 30:
-                    node_name = row[0]
-                    node_id = row[1]  # .replace(':', '_')
-                    node_parents = row[4].split("|")
-                    synonyms = row[7].split("|")
-                    name_to_id[node_name] = node_id
-                    id_to_name[node_id] = node_name
+        # The first 29 rows are the header
+        for row in _iter_tsv_rows(filepath, 29, 8):
+            node_name = row[0].decode("utf-8")
+            node_id = sys.intern(row[1].decode("utf-8"))  # .replace(':', '_')
+            node_parents = [
+                sys.intern(parent) for parent in row[4].decode("utf-8").split("|")
+            ]
+            synonyms = row[7].decode("utf-8").split("|")
+            name_to_id[node_name] = node_id
+            id_to_name[node_id] = node_name
 
-                    if len(node_parents) == 1:  #
-                        # Only consider concepts with 1 direct ancestor
-                        child_to_parent[node_id] = node_parents[0]
+            if len(node_parents) == 1:  #
+                # Only consider concepts with 1 direct ancestor
+                child_to_parent[node_id] = node_parents[0]
 
-                    for synonym in synonyms:
-                        synonym_to_id[synonym] = node_id
+            for synonym in synonyms:
+                synonym_to_id[synonym] = node_id
 
-                    for parent in node_parents:
-                        # To build the edges list, consider
-                        # all concepts with at least one ancestor
+            for parent in node_parents:
+                # To build the edges list, consider
+                # all concepts with at least one ancestor
 
-                        edges.append((node_id, parent))
+                edges.append((node_id, parent))
 
         root_concept_name = self.root_dict[self.kb][1]
         root_concept_id = self.root_dict[self.kb][0]
         name_to_id[root_concept_name] = root_concept_id
         id_to_name[root_concept_id] = root_concept_name
 
-        kb_graph = nx.DiGraph([edge for edge in edges])
-
-        # Build id_to_info (KB-ID: (outdegree, indegree, num_descendants))
-        for node in kb_graph.nodes:
-            num_descendants = len(nx.descendants(kb_graph, node))
-
-            id_to_info[node] = (
-                kb_graph.out_degree(node),
-                kb_graph.in_degree(node),
-                num_descendants,
-            )
-
-        node_to_node = {}
-
-        for edge in edges:
-            if edge[0] in node_to_node:
-                node_to_node[edge[0]].append(edge[1])
-
-            else:
-                node_to_node[edge[0]] = [edge[1]]
-
-            if edge[1] in node_to_node:
-                node_to_node[edge[1]].append(edge[0])
-
-            else:
-                node_to_node[edge[1]] = [edge[0]]
-
-        self.name_to_id = name_to_id
-        self.id_to_name = id_to_name
-        self.id_to_info = id_to_info
-        self.synonym_to_id = synonym_to_id
-        self.edges = edges
-        self.graph = kb_graph
-        self.child_to_parent = child_to_parent
-        self.node_to_node = node_to_node
+        self._finalize(
+            name_to_id,
+            id_to_name,
+            synonym_to_id,
+            edges,
+            child_to_parent=child_to_parent,
+        )
 
     def load_ncbi_taxon(self):
         """Load KBs from local .csv files (NCBITaxon) into structured dicts
             containing the mappings name_to_id, id_to_info, synonym_to_id.
         """
 
-        filepath = data_dir
-
-        if self.kb == "ncbi_taxon":
-            filepath += "NCBITAXON.csv"
+        filepath = ncbi_taxon_filepath
 
         name_to_id = {}
         id_to_name = {}
-        id_to_info = {}
         synonym_to_id = {}
         child_to_parent = {}
         edges = []
@@ -368,12 +625,14 @@ class KnowledgeBase:
                     if rank_node == "species":
                         node_name = row[1]
                         node_id = "NCBITaxon_" + row[0].split("NCBITAXON/")[1]
+                        node_id = sys.intern(node_id)
                         synonyms = row[2].split("|")
                         name_to_id[node_name] = node_id
                         id_to_name[node_id] = node_name
 
                         if row[7] != "":
                             parent_id = "NCBITaxon_" + row[7].split("NCBITAXON/")[1]
+                            parent_id = sys.intern(parent_id)
                             relationship = (node_id, parent_id)
                             edges.append(relationship)
 
@@ -384,42 +643,7 @@ class KnowledgeBase:
                         for synonym in synonyms:
                             synonym_to_id[synonym] = node_id
 
-        # Create a MultiDiGraph object with only "is-a" relations
-        # this will allow the further calculation of shorthest path lenght
-        kb_graph = nx.DiGraph([edge for edge in edges])
-
-        # Build id_to_info (KB-ID: (outdegree, indegree, num_descendants))
-        for node in kb_graph.nodes:
-            num_descendants = len(nx.descendants(kb_graph, node))
-
-            id_to_info[node] = (
-                kb_graph.out_degree(node),
-                kb_graph.in_degree(node),
-                num_descendants,
-            )
-
-        node_to_node = {}
-
-        for edge in edges:
-            if edge[0] in node_to_node:
-                node_to_node[edge[0]].append(edge[1])
-
-            else:
-                node_to_node[edge[0]] = [edge[1]]
-
-            if edge[1] in node_to_node:
-                node_to_node[edge[1]].append(edge[0])
-
-            else:
-                node_to_node[edge[1]] = [edge[0]]
-
-        self.name_to_id = name_to_id
-        self.id_to_name = id_to_name
-        self.id_to_info = id_to_info
-        self.synonym_to_id = synonym_to_id
-        self.edges = edges
-        self.graph = kb_graph
-        self.node_to_node = node_to_node
+        self._finalize(name_to_id, id_to_name, synonym_to_id, edges)
 
     def load_ncbi_gene(self):
         name_to_id = {}
@@ -427,30 +651,25 @@ class KnowledgeBase:
         id_to_info = {}
         synonym_to_id = {}
 
-        with open(f"{data_dir}ncbi_gene/All_Data.gene_info") as ncbi_gene:
-            reader = csv.reader(ncbi_gene, delimiter="\t")
-            row_count = int()
-
-            for row in reader:
-                row_count += 1
+        filepath = ncbi_gene_filepath
 
-                if row_count > 7:
-                    # Skip the header
-                    gene_symbol = row[2]
-                    gene_id = "NCBIGene_" + row[1]
-                    synonyms = row[4].split("/")
-                    description = row[8]
-                    synonym_to_id[description] = gene_id
+        # Skip the header
+        for row in _iter_tsv_rows(filepath, 7, 9):
+            gene_symbol = row[2].decode("utf-8")
+            gene_id = "NCBIGene_" + row[1].decode("utf-8")
+            synonyms = row[4].decode("utf-8").split("/")
+            description = row[8].decode("utf-8")
+            synonym_to_id[description] = gene_id
 
-                    name_to_id[gene_symbol] = gene_id
-                    id_to_name[gene_id] = gene_symbol
+            name_to_id[gene_symbol] = gene_id
+            id_to_name[gene_id] = gene_symbol
 
-                    for synonym in synonyms:
-                        if synonym != "-":
-                            synonym_to_id[synonym] = gene_id
+            for synonym in synonyms:
+                if synonym != "-":
+                    synonym_to_id[synonym] = gene_id
 
         edges = [("NCBIGene1", "NCBIGene2")]
-        kb_graph = nx.DiGraph([edge for edge in edges])
+        kb_graph = nx.DiGraph(edges)
 
         self.name_to_id = name_to_id
         self.id_to_name = id_to_name
@@ -463,7 +682,6 @@ class KnowledgeBase:
         """Load knolwedge base from text files: terms.txt and edges.txt"""
         name_to_id = {}
         id_to_name = {}
-        id_to_info = {}
         synonym_to_id = {}
         edges = []
 
@@ -474,7 +692,7 @@ class KnowledgeBase:
             for line in data:
                 if line != "\n":
                     line_ = line.strip("\n").split("\t")
-                    kb_id = line_[0]
+                    kb_id = sys.intern(line_[0])
                     name = line_[1]
                     name_to_id[name] = kb_id
                     id_to_name[kb_id] = name
@@ -494,41 +712,8 @@ class KnowledgeBase:
             for line in data:
                 if line != "\n":
                     line_ = line.strip("\n").split("\t")
-                    term1 = line_[0]
-                    term2 = line_[1]
+                    term1 = sys.intern(line_[0])
+                    term2 = sys.intern(line_[1])
                     edges.append((term1, term2))
 
-        kb_graph = nx.DiGraph([edge for edge in edges])
-
-        # Build id_to_info (KB-ID: (outdegree, indegree, num_descendants))
-        for node in kb_graph.nodes:
-            num_descendants = len(nx.descendants(kb_graph, node))
-
-            id_to_info[node] = (
-                kb_graph.out_degree(node),
-                kb_graph.in_degree(node),
-                num_descendants,
-            )
-
-        node_to_node = {}
-
-        for edge in edges:
-            if edge[0] in node_to_node:
-                node_to_node[edge[0]].append(edge[1])
-
-            else:
-                node_to_node[edge[0]] = [edge[1]]
-
-            if edge[1] in node_to_node:
-                node_to_node[edge[1]].append(edge[0])
-
-            else:
-                node_to_node[edge[1]] = [edge[0]]
-
-        self.name_to_id = name_to_id
-        self.id_to_name = id_to_name
-        self.id_to_info = id_to_info
-        self.synonym_to_id = synonym_to_id
-        self.edges = edges
-        self.node_to_node = node_to_node
-        self.graph = kb_graph
+        self._finalize(name_to_id, id_to_name, synonym_to_id, edges)